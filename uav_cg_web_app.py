@@ -1,3 +1,5 @@
+from math import cos, radians, sqrt
+
 import streamlit as st
 import plotly.graph_objects as go
 import numpy as np
@@ -11,122 +13,150 @@ st.sidebar.header("Made by Falah Alshamsi - 202001762")
 st.sidebar.header("⚖️ Weight Calculation Parameters")
 
 # Material properties
-rho_mat = st.sidebar.number_input("Material Density (kg/m³)", value=300.0, format="%.10f", help="Density of the material used (e.g., aluminum = 2700 kg/m³).")
+rho_mat = st.sidebar.number_input("Material Density (kg/m³)", value=300.0, format="%g", step=10.0, help="Density of the material used (e.g., aluminum = 2700 kg/m³).")
 # Load factor
-n_ult = st.sidebar.number_input("Ultimate Load Factor (n_ult)", value=3.8, format="%.10f", help="Maximum load factor the UAV can withstand.")
+n_ult = st.sidebar.number_input("Ultimate Load Factor (n_ult)", value=3.8, format="%g", step=0.1, help="Maximum load factor the UAV can withstand.")
 
 # Wing parameters
-wing_area = st.sidebar.number_input("Wing Area (m²)", value=0.5, format="%.10f", help="Total planform area of the wing.")
-wing_AR = st.sidebar.number_input("Wing Aspect Ratio", value=6.0, format="%.10f", help="Aspect ratio of the wing (span² / area).")
-wing_chord = st.sidebar.number_input("Wing Chord (m)", value=0.5, format="%.10f", help="Mean aerodynamic chord of the wing.")
-t_c_max = st.sidebar.number_input("Max Thickness/Chord Ratio", value=0.12, format="%.10f", help="Maximum thickness-to-chord ratio of the wing.")
-Lambda_0_25 = st.sidebar.number_input("Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%.10f", help="Sweep angle at the quarter-chord line.")
-lambda_ratio = st.sidebar.number_input("Wing Taper Ratio", value=0.7, format="%.10f", help="Ratio of tip chord to root chord.")
+wing_area = st.sidebar.number_input("Wing Area (m²)", value=0.5, format="%g", step=0.1, help="Total planform area of the wing.")
+wing_AR = st.sidebar.number_input("Wing Aspect Ratio", value=6.0, format="%g", step=0.1, help="Aspect ratio of the wing (span² / area).")
+wing_chord = st.sidebar.number_input("Wing Chord (m)", value=0.5, format="%g", step=0.01, help="Mean aerodynamic chord of the wing.")
+t_c_max = st.sidebar.number_input("Max Thickness/Chord Ratio", value=0.12, format="%g", step=0.01, help="Maximum thickness-to-chord ratio of the wing.")
+Lambda_0_25 = st.sidebar.number_input("Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%g", step=1.0, help="Sweep angle at the quarter-chord line.")
+lambda_ratio = st.sidebar.number_input("Wing Taper Ratio", value=0.7, format="%g", step=0.01, help="Ratio of tip chord to root chord.")
 K_rho_wing = st.sidebar.number_input("Wing Density Factor (K_rho_wing)", value=0.001, help="Density factor for the wing.")
 
 # Fuselage parameters
-fuselage_length = st.sidebar.number_input("Fuselage Length (m)", value=1.0, format="%.10f", help="Total length of the fuselage.")
-fuselage_diameter = st.sidebar.number_input("Fuselage Diameter (m)", value=0.2, format="%.10f", help="Maximum diameter of the fuselage.")
-K_inlet = st.sidebar.number_input("Inlet Factor (K_inlet)", value=1.0, format="%.10f", help="Factor accounting for inlet design.")
+fuselage_length = st.sidebar.number_input("Fuselage Length (m)", value=1.0, format="%g", step=0.1, help="Total length of the fuselage.")
+fuselage_diameter = st.sidebar.number_input("Fuselage Diameter (m)", value=0.2, format="%g", step=0.01, help="Maximum diameter of the fuselage.")
+K_inlet = st.sidebar.number_input("Inlet Factor (K_inlet)", value=1.0, format="%g", step=0.01, help="Factor accounting for inlet design.")
 K_rho_fuselage = st.sidebar.number_input("Fuselage Density Factor (K_rho_fuselage)", value=0.001, help="Density factor for the fuselage.")
 
 # Horizontal Tail parameters
-ht_area = st.sidebar.number_input("Horizontal Tail Area (m²)", value=0.1, format="%.10f", help="Planform area of the horizontal tail.")
-ht_AR = st.sidebar.number_input("Horizontal Tail Aspect Ratio", value=4.0, format="%.10f", help="Aspect ratio of the horizontal tail.")
-ht_chord = st.sidebar.number_input("Horizontal Tail Chord (m)", value=0.1, format="%.10f", help="Mean aerodynamic chord of the horizontal tail.")
-ht_t_c_max = st.sidebar.number_input("Horizontal Tail Max Thickness/Chord Ratio", value=0.12, format="%.10f", help="Maximum thickness-to-chord ratio of the horizontal tail.")
-ht_Lambda_0_25 = st.sidebar.number_input("Horizontal Tail Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%.10f", help="Sweep angle at the quarter-chord line of the horizontal tail.")
-ht_lambda_ratio = st.sidebar.number_input("Horizontal Tail Taper Ratio", value=1.0, format="%.10f", help="Taper ratio of the horizontal tail.")
+ht_area = st.sidebar.number_input("Horizontal Tail Area (m²)", value=0.1, format="%g", step=0.01, help="Planform area of the horizontal tail.")
+ht_AR = st.sidebar.number_input("Horizontal Tail Aspect Ratio", value=4.0, format="%g", step=0.1, help="Aspect ratio of the horizontal tail.")
+ht_chord = st.sidebar.number_input("Horizontal Tail Chord (m)", value=0.1, format="%g", step=0.01, help="Mean aerodynamic chord of the horizontal tail.")
+ht_t_c_max = st.sidebar.number_input("Horizontal Tail Max Thickness/Chord Ratio", value=0.12, format="%g", step=0.01, help="Maximum thickness-to-chord ratio of the horizontal tail.")
+ht_Lambda_0_25 = st.sidebar.number_input("Horizontal Tail Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%g", step=1.0, help="Sweep angle at the quarter-chord line of the horizontal tail.")
+ht_lambda_ratio = st.sidebar.number_input("Horizontal Tail Taper Ratio", value=1.0, format="%g", step=0.01, help="Taper ratio of the horizontal tail.")
 K_rho_ht = st.sidebar.number_input("Horizontal Tail Density Factor (K_rho_ht)", value=0.0001, help="Density factor for the horizontal tail.")
 
 # Vertical Tail parameters
-vt_area = st.sidebar.number_input("Vertical Tail Area (m²)", value=0.05, format="%.10f", help="Planform area of the vertical tail.")
-vt_AR = st.sidebar.number_input("Vertical Tail Aspect Ratio", value=3.0, format="%.10f", help="Aspect ratio of the vertical tail.")
-vt_chord = st.sidebar.number_input("Vertical Tail Chord (m)", value=0.05, format="%.10f", help="Mean aerodynamic chord of the vertical tail.")
-vt_t_c_max = st.sidebar.number_input("Vertical Tail Max Thickness/Chord Ratio", value=0.12, format="%.10f", help="Maximum thickness-to-chord ratio of the vertical tail.")
-vt_Lambda_0_25 = st.sidebar.number_input("Vertical Tail Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%.10f", help="Sweep angle at the quarter-chord line of the vertical tail.")
-vt_lambda_ratio = st.sidebar.number_input("Vertical Tail Taper Ratio", value=1.0, format="%.10f", help="Taper ratio of the vertical tail.")
-V_v = st.sidebar.number_input("Vertical Tail Volume Coefficient", value=0.2, format="%.10f", help="Volume coefficient of the vertical tail.")
-C_T = st.sidebar.number_input("Tail Cone Coefficient (C_T)", value=1.0, format="%.10f", help="Coefficient for the tail cone design.")
-C_V = st.sidebar.number_input("Vertical Tail Coefficient (C_V)", value=1.0, format="%.10f", help="Coefficient for the vertical tail design.")
+vt_area = st.sidebar.number_input("Vertical Tail Area (m²)", value=0.05, format="%g", step=0.01, help="Planform area of the vertical tail.")
+vt_AR = st.sidebar.number_input("Vertical Tail Aspect Ratio", value=3.0, format="%g", step=0.1, help="Aspect ratio of the vertical tail.")
+vt_chord = st.sidebar.number_input("Vertical Tail Chord (m)", value=0.05, format="%g", step=0.01, help="Mean aerodynamic chord of the vertical tail.")
+vt_t_c_max = st.sidebar.number_input("Vertical Tail Max Thickness/Chord Ratio", value=0.12, format="%g", step=0.01, help="Maximum thickness-to-chord ratio of the vertical tail.")
+vt_Lambda_0_25 = st.sidebar.number_input("Vertical Tail Quarter-Chord Sweep Angle (degrees)", value=0.0, format="%g", step=1.0, help="Sweep angle at the quarter-chord line of the vertical tail.")
+vt_lambda_ratio = st.sidebar.number_input("Vertical Tail Taper Ratio", value=1.0, format="%g", step=0.01, help="Taper ratio of the vertical tail.")
+V_v = st.sidebar.number_input("Vertical Tail Volume Coefficient", value=0.2, format="%g", step=0.01, help="Volume coefficient of the vertical tail.")
+C_T = st.sidebar.number_input("Tail Cone Coefficient (C_T)", value=1.0, format="%g", step=0.01, help="Coefficient for the tail cone design.")
+C_V = st.sidebar.number_input("Vertical Tail Coefficient (C_V)", value=1.0, format="%g", step=0.01, help="Coefficient for the vertical tail design.")
 K_rho_vt = st.sidebar.number_input("Vertical Tail Density Factor (K_rho_vt)", value=0.0001, help="Density factor for the vertical tail.")
 
 # Gravity
 g = 9.81  # Gravity constant
 # ================== Weight Calculation Functions ==================
-def calculate_wing_weight():
+# Pure functions of their arguments so st.cache_data can memoize them:
+# reruns where only unrelated widgets changed skip the recomputation entirely.
+@st.cache_data
+def calc_surface_weight(area, chord, t_c, rho_mat, K_rho, AR, n_ult, sweep_deg,
+                        taper, extra=1.0):
+    # Shared lifting-surface weight formula (wing, HT, VT); `extra` folds in
+    # the VT-only volume-coefficient factors and is 1.0 elsewhere.
     return (
-        wing_area * wing_chord * t_c_max * rho_mat * K_rho_wing * 
-        ((wing_AR * n_ult) / np.cos(np.radians(Lambda_0_25))) ** 0.6 * 
-        lambda_ratio ** 0.04 * g
+        area * chord * t_c * rho_mat * K_rho *
+        ((AR * n_ult) / cos(radians(sweep_deg))) ** 0.6 *
+        taper ** 0.04 * extra * g
     )
 
-def calculate_fuselage_weight():
+@st.cache_data
+def calculate_fuselage_weight(fuselage_length, fuselage_diameter, rho_mat,
+                              K_rho_fuselage, n_ult, K_inlet):
     return (
         fuselage_length * fuselage_diameter ** 2 * rho_mat * K_rho_fuselage *
         n_ult ** 0.25 * K_inlet * 8
     )
 
-
-def calculate_horizontal_tail_weight():
-    return (
-        ht_area * ht_chord * ht_t_c_max * rho_mat * K_rho_ht *
-        ((ht_AR / np.cos(np.radians(ht_Lambda_0_25))) ** 0.6 *
-        ht_lambda_ratio ** 0.04 * g
-    )
+@st.cache_data
+def sweep_wing_weight(sweep_lo, sweep_hi, n_points, area, chord, t_c, rho_mat,
+                      K_rho, AR, n_ult, taper):
+    # Wing weight over a whole range of quarter-chord sweep angles in one
+    # vectorized NumPy expression — no per-angle Python loop
+    sweep = np.linspace(sweep_lo, sweep_hi, n_points)
+    weights = (
+        area * chord * t_c * rho_mat * K_rho *
+        ((AR * n_ult) / np.cos(np.radians(sweep))) ** 0.6 *
+        taper ** 0.04 * g
     )
+    return sweep, weights
+# ================== Default Components ==================
+# Pre-baked default component table as immutable constants; session-state
+# init copies them so later edits never touch the defaults. Structural
+# members start with placeholder weights overwritten by the formulas above.
+DEFAULT_NAMES = (
+    "Camera", "LiDAR", "GPS", "Comms", "Battery",
+    "Wing", "Fuselage", "Horizontal Tail", "Vertical Tail",
+)
+DEFAULT_POS = np.array([
+    [0.2, 0, 0.75],
+    [0.3, 0, 0.75],
+    [0.4, 0, 0.75],
+    [0.5, 0, 0.75],
+    [0.7, 0, 0.75],
+    [0.5, 0, 0.5],   # Wing
+    [0.5, 0, 0.5],   # Fuselage
+    [0.5, 0, 0.0],   # Horizontal Tail
+    [0.5, 0, 0.0],   # Vertical Tail
+])
+DEFAULT_W = np.array(
+    [0.125, 0.050, 0.076, 0.050, 0.559, 0, 0, 0, 0], dtype=np.float64
+)
 
-def calculate_vertical_tail_weight():
-    return (
-        vt_area * vt_chord * vt_t_c_max * rho_mat * K_rho_vt *
-        ((vt_AR / np.cos(np.radians(vt_Lambda_0_25))) ** 0.6 *
-        vt_lambda_ratio ** 0.04 * V_v ** 0.2 * (C_T / C_V) ** 0.4 * g
-    )
-    )
 # ================== Initialize Components ==================
-if "components" not in st.session_state:
-    st.session_state.components = [
-        {"name": "Camera", "weight": 125, "x": 0.2, "y": 0, "z": 0.75, "weight_kg": 0.125},
-        {"name": "LiDAR", "weight": 50, "x": 0.3, "y": 0, "z": 0.75, "weight_kg": 0.050},
-        {"name": "GPS", "weight": 76, "x": 0.4, "y": 0, "z": 0.75, "weight_kg": 0.076},
-        {"name": "Comms", "weight": 50, "x": 0.5, "y": 0, "z": 0.75, "weight_kg": 0.050},
-        {"name": "Battery", "weight": 559, "x": 0.7, "y": 0, "z": 0.75, "weight_kg": 0.559},
-        {"name": "Wing", "weight": 0, "x": 0.5, "y": 0, "z": 0.5, "weight_kg": 0},  # Placeholder
-        {"name": "Fuselage", "weight": 0, "x": 0.5, "y": 0, "z": 0.5, "weight_kg": 0},  # Placeholder
-        {"name": "Horizontal Tail", "weight": 0, "x": 0.5, "y": 0, "z": 0, "weight_kg": 0},  # Placeholder
-        {"name": "Vertical Tail", "weight": 0, "x": 0.5, "y": 0, "z": 0, "weight_kg": 0},  # Placeholder
-    ]
+# Components live as parallel arrays (structure-of-arrays): a names list,
+# an (N, 3) position array and an N-vector of weights in kg. CG and the
+# plot then read whole columns instead of looping over dicts.
+if "names" not in st.session_state:
+    st.session_state.names = list(DEFAULT_NAMES)
+    st.session_state.pos = DEFAULT_POS.copy()
+    st.session_state.w = DEFAULT_W.copy()
+    # Name -> row index, kept in sync on add/remove so lookups are O(1)
+    st.session_state.idx = {name: i for i, name in enumerate(DEFAULT_NAMES)}
+    # Row indices queued for removal, consumed at the top of the next run
+    st.session_state.pending_removes = set()
 
 # ================== Update Component Weights ==================
 def update_component_weights():
-    # Recalculate weights
-    wing_weight = calculate_wing_weight()
-    fuse_weight = calculate_fuselage_weight()
-    vt_weight = calculate_vertical_tail_weight()
-    ht_weight = calculate_horizontal_tail_weight()
+    # Recalculate weights (cache hits unless the relevant inputs changed)
+    wing_weight = calc_surface_weight(wing_area, wing_chord, t_c_max, rho_mat,
+                                      K_rho_wing, wing_AR, n_ult, Lambda_0_25,
+                                      lambda_ratio)
+    fuse_weight = calculate_fuselage_weight(fuselage_length, fuselage_diameter,
+                                            rho_mat, K_rho_fuselage, n_ult, K_inlet)
+    vt_weight = calc_surface_weight(vt_area, vt_chord, vt_t_c_max, rho_mat,
+                                    K_rho_vt, vt_AR, n_ult, vt_Lambda_0_25,
+                                    vt_lambda_ratio,
+                                    extra=V_v ** 0.2 * (C_T / C_V) ** 0.4)
+    ht_weight = calc_surface_weight(ht_area, ht_chord, ht_t_c_max, rho_mat,
+                                    K_rho_ht, ht_AR, n_ult, ht_Lambda_0_25,
+                                    ht_lambda_ratio)
 
     # Update weights in session state
-    for comp in st.session_state.components:
-        if comp["name"] == "Wing":
-            comp["weight"] = wing_weight * 1000
-            comp["weight_kg"] = wing_weight
-        elif comp["name"] == "Fuselage":
-            comp["weight"] = fuse_weight * 1000
-            comp["weight_kg"] = fuse_weight
-        elif comp["name"] == "Horizontal Tail":
-            comp["weight"] = ht_weight * 1000
-            comp["weight_kg"] = ht_weight
-        elif comp["name"] == "Vertical Tail":
-            comp["weight"] = vt_weight * 1000
-            comp["weight_kg"] = vt_weight
-
-# Update weights whenever inputs change
-update_component_weights()
+    idx = st.session_state.idx
+    w = st.session_state.w
+    for name, weight in (("Wing", wing_weight), ("Fuselage", fuse_weight),
+                         ("Horizontal Tail", ht_weight), ("Vertical Tail", vt_weight)):
+        if name in idx:
+            w[idx[name]] = weight
+    return wing_weight, fuse_weight, ht_weight, vt_weight
+
+# Update weights whenever inputs change; the display section below reuses the
+# returned values instead of re-invoking the weight functions
+wing_weight, fuse_weight, ht_weight, vt_weight = update_component_weights()
 # ================== Display Weight Calculations ==================
 st.subheader("📝 Weight Calculations")
 
 # Wing Weight Calculation
-wing_weight = calculate_wing_weight()
 st.markdown(f"**Wing Weight:**")
 st.latex(rf"""
 W_W = S_W \cdot MAC \cdot \left( \frac{{t}}{{C}} \right)_{{\max}} \cdot \rho_{{\text{{mat}}}} \cdot K_\rho \cdot \left( \frac{{\text{{AR}} \cdot n_{{\text{{ult}}}}}}{{\cos(\Lambda_{{0.25}})}} \right)^{{0.6}} \cdot \lambda^{{0.04}} \cdot g
@@ -134,7 +164,6 @@ W_W = S_W \cdot MAC \cdot \left( \frac{{t}}{{C}} \right)_{{\max}} \cdot \rho_{{\
 st.markdown(f"**Calculated Wing Weight:** {wing_weight:.2f} kg")
 
 # Fuselage Weight Calculation
-fuse_weight = calculate_fuselage_weight()
 st.markdown(f"**Fuselage Weight:**")
 st.latex(rf"""
 W_F = L_f \cdot D^2_{{\max}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_f}} \cdot n_{{\text{{ult}}}}^{{0.25}} \cdot K_{{\text{{inlet}}}} \cdot g
@@ -142,38 +171,65 @@ W_F = L_f \cdot D^2_{{\max}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_f}} \cdo
 st.markdown(f"**Calculated Fuselage Weight:** {fuse_weight:.2f} kg")
 
 # Vertical Tail Weight Calculation
-vt_weight = calculate_vertical_tail_weight()
 st.markdown(f"**Vertical Tail Weight:**")
 st.latex(rf"""
-W_{{VT}} = S_{{VT}} \cdot MAC_{{VT}} \cdot \left( \frac{{t}}{{C}} \right)_{{\max \text{{VT}}}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_{{VT}}}} \cdot \left( \frac{{\text{{AR}}_{{VT}}}}{{\cos(\Lambda_{{0.25_{{VT}}}})}} \right)^{{0.6}} \cdot \lambda^{{0.04}}_{{VT}} \cdot \bar{{V}}_V^{{0.2}} \left( \frac{{C_T}}{{C_V}} \right)^{{0.4}}
+W_{{VT}} = S_{{VT}} \cdot MAC_{{VT}} \cdot \left( \frac{{t}}{{C}} \right)_{{\max \text{{VT}}}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_{{VT}}}} \cdot \left( \frac{{\text{{AR}}_{{VT}} \cdot n_{{\text{{ult}}}}}}{{\cos(\Lambda_{{0.25_{{VT}}}})}} \right)^{{0.6}} \cdot \lambda^{{0.04}}_{{VT}} \cdot \bar{{V}}_V^{{0.2}} \left( \frac{{C_T}}{{C_V}} \right)^{{0.4}} \cdot g
 """)
 st.markdown(f"**Calculated Vertical Tail Weight:** {vt_weight:.2f} kg")
 
 # Horizontal Tail Weight Calculation
-ht_weight = calculate_horizontal_tail_weight()
 st.markdown(f"**Horizontal Tail Weight:**")
 st.latex(rf"""
-W_{{HT}} = S_{{HT}} \cdot MAC_{{HT}} \cdot \left( \frac{{t}}{{C}} \right)_{{\max \text{{HT}}}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_{{HT}}}} \cdot \left( \frac{{\text{{AR}}_{{HT}}}}{{\cos(\Lambda_{{0.25_{{HT}}}})}} \right)^{{0.6}} \cdot \lambda^{{0.04}}_{{HT}} \cdot g
+W_{{HT}} = S_{{HT}} \cdot MAC_{{HT}} \cdot \left( \frac{{t}}{{C}} \right)_{{\max \text{{HT}}}} \cdot \rho_{{\text{{mat}}}} \cdot K_{{\rho_{{HT}}}} \cdot \left( \frac{{\text{{AR}}_{{HT}} \cdot n_{{\text{{ult}}}}}}{{\cos(\Lambda_{{0.25_{{HT}}}})}} \right)^{{0.6}} \cdot \lambda^{{0.04}}_{{HT}} \cdot g
 """)
 st.markdown(f"**Calculated Horizontal Tail Weight:** {ht_weight:.2f} kg")
+
+# ================== Sweep Analysis ==================
+with st.expander("📈 Wing Weight vs Sweep Angle"):
+    sweep_lo, sweep_hi = st.slider("Sweep angle range (degrees)", -60.0, 60.0,
+                                   (0.0, 30.0), step=1.0)
+    sweep_angles, sweep_weights = sweep_wing_weight(
+        sweep_lo, sweep_hi, 121, wing_area, wing_chord, t_c_max, rho_mat,
+        K_rho_wing, wing_AR, n_ult, lambda_ratio
+    )
+    st.line_chart(pd.DataFrame({"Wing Weight (kg)": sweep_weights},
+                               index=pd.Index(sweep_angles, name="Sweep (deg)")))
+
 # ================== Adjust Component Positions and Weights ==================
-def adjust_component_positions_and_weights(components):
+def queue_remove(i):
+    st.session_state.pending_removes.add(i)
+
+def apply_pending_removes():
+    # Drop rows queued by the Remove buttons before any widgets render, so
+    # the component list is never mutated while it is being iterated
+    pending = st.session_state.pending_removes
+    if pending:
+        keep = [i for i in range(len(st.session_state.names)) if i not in pending]
+        st.session_state.names = [st.session_state.names[i] for i in keep]
+        st.session_state.pos = st.session_state.pos[keep]
+        st.session_state.w = st.session_state.w[keep]
+        st.session_state.idx = {n: j for j, n in enumerate(st.session_state.names)}
+        pending.clear()
+
+def adjust_component_positions_and_weights():
     st.subheader("🔧 Adjust Component Positions and Weights")
-    for i, comp in enumerate(components):
-        st.write(f"### {comp['name']}")
-        col1, col2, col3, col4, col5 = st.columns(5)
-        comp['x'] = col1.number_input(f"{comp['name']} - X (m)", value=float(comp.get('x', 0.5)), step=0.01, key=f"x_{i}")
-        comp['y'] = col2.number_input(f"{comp['name']} - Y (m)", value=float(comp.get('y', 0.0)), step=0.01, key=f"y_{i}")
-        comp['z'] = col3.number_input(f"{comp['name']} - Z (m)", value=float(comp.get('z', 0.0)), step=0.01, key=f"z_{i}")
-        comp['weight'] = col4.number_input(f"{comp['name']} - Weight (g)", value=float(comp.get('weight', 0)), step=1.0, key=f"weight_{i}")
-        comp['weight_kg'] = comp['weight'] / 1000
-        if col5.button(f"Remove {comp['name']}", key=f"remove_{i}"):
-            components.pop(i)
-            st.rerun()
-    return components
+    apply_pending_removes()
+    names = st.session_state.names
+    pos = st.session_state.pos
+    w = st.session_state.w
+    # One st.columns layout for the whole grid instead of one per component;
+    # each column collects its widget for every row, and the component name
+    # lives in the widget labels
+    col1, col2, col3, col4, col5 = st.columns(5)
+    for i, name in enumerate(names):
+        pos[i, 0] = col1.number_input(f"{name} - X (m)", value=float(pos[i, 0]), step=0.01, key=f"x_{i}")
+        pos[i, 1] = col2.number_input(f"{name} - Y (m)", value=float(pos[i, 1]), step=0.01, key=f"y_{i}")
+        pos[i, 2] = col3.number_input(f"{name} - Z (m)", value=float(pos[i, 2]), step=0.01, key=f"z_{i}")
+        w[i] = col4.number_input(f"{name} - Weight (g)", value=float(w[i] * 1000), step=1.0, key=f"weight_{i}") / 1000
+        col5.button(f"Remove {name}", key=f"remove_{i}", on_click=queue_remove, args=(i,))
 
 # ================== Add New Component ==================
-def add_component(components):
+def add_component():
     st.subheader("➕ Add New Component")
     col1, col2, col3, col4 = st.columns(4)
     name = col1.text_input("Component Name", value="New Component")
@@ -182,163 +238,220 @@ def add_component(components):
     y = col4.number_input("Y (m)", value=0.0, step=0.01)
     z = st.number_input("Z (m)", value=0.0, step=0.01)
     if st.button("Add Component"):
-        components.append({
-            "name": name,
-            "weight": weight,
-            "x": x,
-            "y": y,
-            "z": z,
-            "weight_kg": weight / 1000
-        })
+        st.session_state.names.append(name)
+        st.session_state.pos = np.vstack([st.session_state.pos, [x, y, z]])
+        st.session_state.w = np.append(st.session_state.w, weight / 1000)
+        st.session_state.idx[name] = len(st.session_state.names) - 1
         st.rerun()
 
 # ================== Calculate CG ==================
-def calculate_CG(components):
-    W_total = sum(c['weight_kg'] for c in components)
-    cg_x = sum(c['x'] * c['weight_kg'] for c in components) / W_total
-    cg_y = sum(c['y'] * c['weight_kg'] for c in components) / W_total
-    cg_z = sum(c['z'] * c['weight_kg'] for c in components) / W_total
+def calculate_CG(pos, w):
+    # Single weighted-average pass in NumPy instead of four Python loops
+    W_total = w.sum()
+    cg_x, cg_y, cg_z = (pos.T @ w) / W_total
     return W_total, cg_x, cg_y, cg_z
 
-# ================== Adjust Components and Add New Ones ==================
-st.session_state.components = adjust_component_positions_and_weights(st.session_state.components)
-add_component(st.session_state.components)
-
-# ================== Calculate and Display CG ==================
-W_total, cg_x, cg_y, cg_z = calculate_CG(st.session_state.components)
-st.markdown(f"### 📍 Total Weight: **{W_total:.2f} kg**")
-st.markdown(f"### 🎯 Center of Gravity (CG): **({cg_x:.2f}, {cg_y:.2f}, {cg_z:.2f}) m**")
-
-# ================== Derived Dimensions ==================
-# Wing dimensions
-wing_span = np.sqrt(wing_area * wing_AR)  # Wing span (m)
-wing_chord = wing_area / wing_span  # Mean aerodynamic chord (m)
-
-# Horizontal Tail dimensions
-ht_span = np.sqrt(ht_area * ht_AR)  # Horizontal tail span (m)
-ht_chord = ht_area / ht_span  # Mean aerodynamic chord (m)
-
-# Vertical Tail dimensions
-vt_height = np.sqrt(vt_area * vt_AR)  # Vertical tail height (m)
-vt_chord = vt_area / vt_height  # Mean aerodynamic chord (m)
-
-# ================== 3D Visualization ==================
-fig = go.Figure()
-
-# Fuselage cylinder
-def create_fuselage(x_center, length, diameter):
-    z = np.linspace(x_center - length / 2, x_center + length / 2, 50)
-    theta = np.linspace(0, 2 * np.pi, 50)
+# ================== Fuselage Mesh ==================
+# 24 points around the circumference and 16 along the axis are plenty for a
+# plain cylinder; float32 halves the bytes serialized to plotly.js
+FUSE_N_THETA, FUSE_N_Z = 24, 16
+_FUSE_COLORSCALE = [[0, 'gray'], [1, 'gray']]
+
+# Fuselage cylinder — memoized: the mesh only depends on the scalar inputs,
+# so reruns that just move components reuse the cached arrays
+@st.cache_data
+def create_fuselage(x_center, length, diameter, n_theta=FUSE_N_THETA, n_z=FUSE_N_Z):
+    z = np.linspace(x_center - length / 2, x_center + length / 2, n_z)
+    theta = np.linspace(0, 2 * np.pi, n_theta)
     theta_grid, z_grid = np.meshgrid(theta, z)
     x_grid = diameter / 2 * np.cos(theta_grid) + x_center
     y_grid = diameter / 2 * np.sin(theta_grid)
-    return x_grid, y_grid, z_grid
-
-fuselage_x, fuselage_y, fuselage_z = create_fuselage(0.5, fuselage_length, fuselage_diameter)
-fig.add_trace(go.Surface(
-    x=fuselage_x, y=fuselage_y, z=fuselage_z,
-    colorscale=[[0, 'gray'], [1, 'gray']],
-    showscale=False,
-    opacity=0.8,
-    name="Fuselage"
-))
-
-# Wing mesh (z=0.5)
-wing = next((c for c in st.session_state.components if c['name'] == "Wing"), None)
-if wing:
-    wing_x = [wing['x'] - wing_span / 2, wing['x'] + wing_span / 2]
-    wing_y = [wing['y'] - wing_chord / 2, wing['y'] + wing_chord / 2]
-    fig.add_trace(go.Mesh3d(
-        x=[wing_x[0], wing_x[1], wing_x[1], wing_x[0]],
-        y=[wing_y[0], wing_y[0], wing_y[1], wing_y[1]],
-        z=[wing['z']] * 4,  # Now at z=0.5
-        color='green',
-        opacity=0.8,
-        name="Wing"
-    ))
-
-# Horizontal Tail mesh (z=0)
-ht = next((c for c in st.session_state.components if c['name'] == "Horizontal Tail"), None)
-if ht:
-    ht_x = [ht['x'] - ht_span / 2, ht['x'] + ht_span / 2]
-    ht_y = [ht['y'] - ht_chord / 2, ht['y'] + ht_chord / 2]
-    fig.add_trace(go.Mesh3d(
-        x=[ht_x[0], ht_x[1], ht_x[1], ht_x[0]],
-        y=[ht_y[0], ht_y[0], ht_y[1], ht_y[1]],
-        z=[ht['z']] * 4,  # Now at z=0
-        color='orange',
+    return (x_grid.astype(np.float32), y_grid.astype(np.float32),
+            z_grid.astype(np.float32))
+
+# ================== Persistent Figure ==================
+# The figure skeleton (trace structure, styling, static layout) is built once
+# and kept alive with st.cache_resource; reruns only write new coordinate
+# arrays into the existing traces instead of reconstructing everything.
+FUSELAGE_TRACE, SURFACES_TRACE, COMPONENTS_TRACE, CG_TRACE = range(4)
+
+@st.cache_resource
+def get_figure():
+    fig = go.Figure()
+    fig.add_trace(go.Surface(
+        colorscale=_FUSE_COLORSCALE,
+        showscale=False,
         opacity=0.8,
-        name="Horizontal Tail"
+        name="Fuselage"
     ))
-
-# Vertical Tail mesh (z=0)
-vt = next((c for c in st.session_state.components if c['name'] == "Vertical Tail"), None)
-if vt:
-    vt_x = [vt['x'] - vt_chord / 2, vt['x'] + vt_chord / 2]
-    vt_z = [vt['z'] - vt_height / 2, vt['z'] + vt_height / 2]
     fig.add_trace(go.Mesh3d(
-        x=[vt_x[0], vt_x[1], vt_x[1], vt_x[0]],
-        y=[vt['y']] * 4,
-        z=[vt_z[0], vt_z[0], vt_z[1], vt_z[1]],
-        color='purple',
         opacity=0.8,
-        name="Vertical Tail"
+        name="Lifting Surfaces"
     ))
-
-# Components and CG
-for comp in st.session_state.components:
     fig.add_trace(go.Scatter3d(
-        x=[comp['x']], y=[comp['y']], z=[comp['z']],
         mode='markers+text',
         marker=dict(size=5, color='royalblue'),
-        text=[comp['name']],
         textposition="top center",
-        name=comp['name']
+        name="Components"
     ))
-
-fig.add_trace(go.Scatter3d(
-    x=[cg_x], y=[cg_y], z=[cg_z],
-    mode='markers+text',
-    marker=dict(size=6, color='red', symbol='x'),
-    text=["CG"],
-    textposition="bottom center",
-    name="CG"
-))
-
-fig.update_layout(
-    title="UAV Component Placement & CG",
-    scene=dict(
-        xaxis_title='X (m)',
-        yaxis_title='Y (m)',
-        zaxis_title='Z (m)',
-        aspectmode='data',
-        bgcolor='white'
-    ),
-    width=800,
-    height=600,
-    margin=dict(l=0, r=0, b=0, t=40)
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-# ================== Results Table ==================
-st.subheader("📊 Component Details and CG Contributions")
-table_data = []
-for comp in st.session_state.components:
-    table_data.append({
-        "Component": comp['name'],
-        "Weight (kg)": f"{comp['weight_kg']:.2f}",
-        "Position (x, y, z)": f"({comp['x']:.2f}, {comp['y']:.2f}, {comp['z']:.2f})",
-        "CG Contribution": f"({comp['x'] * comp['weight_kg']:.2f}, {comp['y'] * comp['weight_kg']:.2f}, {comp['z'] * comp['weight_kg']:.2f})"
+    fig.add_trace(go.Scatter3d(
+        mode='markers+text',
+        marker=dict(size=6, color='red', symbol='x'),
+        text=["CG"],
+        textposition="bottom center",
+        name="CG"
+    ))
+    fig.update_layout(
+        title="UAV Component Placement & CG",
+        scene=dict(
+            xaxis=dict(title='X (m)'),
+            yaxis=dict(title='Y (m)'),
+            zaxis=dict(title='Z (m)'),
+            aspectmode='cube',
+            bgcolor='white'
+        ),
+        width=800,
+        height=600,
+        margin=dict(l=0, r=0, b=0, t=40)
+    )
+    return fig
+
+# ================== Component Editor, CG & Visualization ==================
+# Runs as a fragment: moving or editing a component reruns only this block,
+# so the sidebar-driven structural weight section is not re-executed.
+@st.fragment
+def render_component_section():
+    # ================== Adjust Components and Add New Ones ==================
+    adjust_component_positions_and_weights()
+    add_component()
+
+    # ================== Calculate and Display CG ==================
+    W_total, cg_x, cg_y, cg_z = calculate_CG(st.session_state.pos, st.session_state.w)
+    st.markdown(f"### 📍 Total Weight: **{W_total:.2f} kg**")
+    st.markdown(f"### 🎯 Center of Gravity (CG): **({cg_x:.2f}, {cg_y:.2f}, {cg_z:.2f}) m**")
+
+    # ================== Derived Dimensions ==================
+    # Wing dimensions (scalar math.sqrt — no ufunc dispatch on plain floats)
+    wing_span = sqrt(wing_area * wing_AR)  # Wing span (m)
+    wing_chord = wing_area / wing_span  # Mean aerodynamic chord (m)
+
+    # Horizontal Tail dimensions
+    ht_span = sqrt(ht_area * ht_AR)  # Horizontal tail span (m)
+    ht_chord = ht_area / ht_span  # Mean aerodynamic chord (m)
+
+    # Vertical Tail dimensions
+    vt_height = sqrt(vt_area * vt_AR)  # Vertical tail height (m)
+    vt_chord = vt_area / vt_height  # Mean aerodynamic chord (m)
+
+    # ================== 3D Visualization ==================
+    fig = get_figure()
+
+    fuselage_x, fuselage_y, fuselage_z = create_fuselage(0.5, fuselage_length, fuselage_diameter)
+
+    names = st.session_state.names
+    pos = st.session_state.pos
+    idx = st.session_state.idx
+
+    # Wing/tail surfaces — one Mesh3d with combined vertex and face arrays
+    # instead of one trace per surface, so plotly.js gets a single draw call
+    mesh_x, mesh_y, mesh_z = [], [], []
+    mesh_i, mesh_j, mesh_k = [], [], []
+    face_colors = []
+
+    def add_quad(xs, ys, zs, color):
+        base = len(mesh_x)
+        mesh_x.extend(xs)
+        mesh_y.extend(ys)
+        mesh_z.extend(zs)
+        # Two triangles per quad, indexed into the shared vertex arrays
+        mesh_i.extend((base, base))
+        mesh_j.extend((base + 1, base + 2))
+        mesh_k.extend((base + 2, base + 3))
+        face_colors.extend((color, color))
+
+    # Wing quad (z=0.5)
+    if "Wing" in idx:
+        wx, wy, wz = pos[idx["Wing"]]
+        add_quad(
+            [wx - wing_span / 2, wx + wing_span / 2, wx + wing_span / 2, wx - wing_span / 2],
+            [wy - wing_chord / 2, wy - wing_chord / 2, wy + wing_chord / 2, wy + wing_chord / 2],
+            [wz] * 4,
+            'green'
+        )
+
+    # Horizontal Tail quad (z=0)
+    if "Horizontal Tail" in idx:
+        hx, hy, hz = pos[idx["Horizontal Tail"]]
+        add_quad(
+            [hx - ht_span / 2, hx + ht_span / 2, hx + ht_span / 2, hx - ht_span / 2],
+            [hy - ht_chord / 2, hy - ht_chord / 2, hy + ht_chord / 2, hy + ht_chord / 2],
+            [hz] * 4,
+            'orange'
+        )
+
+    # Vertical Tail quad (vertical, spanning z)
+    if "Vertical Tail" in idx:
+        vx, vy, vz = pos[idx["Vertical Tail"]]
+        add_quad(
+            [vx - vt_chord / 2, vx + vt_chord / 2, vx + vt_chord / 2, vx - vt_chord / 2],
+            [vy] * 4,
+            [vz - vt_height / 2, vz - vt_height / 2, vz + vt_height / 2, vz + vt_height / 2],
+            'purple'
+        )
+
+    # Write the fresh arrays into the persistent traces in one batched update;
+    # only the data — not the trace structure or styling — changes per rerun.
+    # Components go as one batched trace so Plotly serializes a single JSON
+    # blob and renders a single object.
+    # Fixed cube ranges derived from the fuselage extent: with aspectmode='data'
+    # plotly.js recomputes the scene layout from the data on every update, while
+    # fixed ranges let it reuse the previous layout.
+    axis_half_range = fuselage_length
+    with fig.batch_update():
+        fig.data[FUSELAGE_TRACE].update(x=fuselage_x, y=fuselage_y, z=fuselage_z)
+        fig.data[SURFACES_TRACE].update(
+            x=mesh_x, y=mesh_y, z=mesh_z,
+            i=mesh_i, j=mesh_j, k=mesh_k,
+            facecolor=face_colors
+        )
+        fig.data[COMPONENTS_TRACE].update(x=pos[:, 0], y=pos[:, 1], z=pos[:, 2],
+                                          text=names)
+        fig.data[CG_TRACE].update(x=[cg_x], y=[cg_y], z=[cg_z])
+        fig.update_layout(scene=dict(
+            xaxis_range=[0.5 - axis_half_range, 0.5 + axis_half_range],
+            yaxis_range=[-axis_half_range, axis_half_range],
+            zaxis_range=[-axis_half_range, axis_half_range],
+        ))
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ================== Results Table ==================
+    st.subheader("📊 Component Details and CG Contributions")
+    # Build the table straight from the component arrays: the per-axis CG
+    # contributions come from one broadcasted multiply instead of a Python loop
+    w = st.session_state.w
+    contrib = pos * w[:, None]
+    df = pd.DataFrame({
+        "Component": names,
+        "Weight (kg)": w,
+        "X (m)": pos[:, 0],
+        "Y (m)": pos[:, 1],
+        "Z (m)": pos[:, 2],
+        "CG X": contrib[:, 0],
+        "CG Y": contrib[:, 1],
+        "CG Z": contrib[:, 2],
     })
 
-# Add the TOTAL row
-table_data.append({
-    "Component": "TOTAL",
-    "Weight (kg)": f"{W_total:.2f}",
-    "Position (x, y, z)": "-",
-    "CG Contribution": f"({cg_x:.2f}, {cg_y:.2f}, {cg_z:.2f})"  # Directly display CG coordinates
-})
+    # Add the TOTAL row (CG columns show the CG coordinates directly)
+    total_row = pd.DataFrame([{
+        "Component": "TOTAL",
+        "Weight (kg)": W_total,
+        "X (m)": np.nan, "Y (m)": np.nan, "Z (m)": np.nan,
+        "CG X": cg_x, "CG Y": cg_y, "CG Z": cg_z,
+    }])
+    df = pd.concat([df, total_row], ignore_index=True)
+
+    # Display the table
+    st.table(df.style.format("{:.2f}", subset=df.columns[1:], na_rep="-"))
 
-# Display the table
-st.table(pd.DataFrame(table_data))
+render_component_section()